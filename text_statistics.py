@@ -2,66 +2,98 @@
 A python implementation of https://github.com/DaveChild/Text-Statistics/. I saw it
 and really liked the idea.
 
-All functions take a string and return a Decimal score.
+All functions take a string and return a float score. To work out several scores
+for the same text call analyze() once and pass the TextStats it returns instead.
 
 """
-from decimal import Decimal as D
 from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache, wraps
 from math import sqrt
 import re
 import sys
+import threading
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Texts longer than this are never cached, the cache would otherwise keep
+# hold of them long after they're needed
+_cache_text_limit = 100000
+
+def _cache_by_text(func=None, maxsize=1024):
+    """Remembers the results for the last maxsize texts (or TextStats) so asking
+    for the same thing again is free, use func.cache_clear() to reset it"""
+    if func is None:
+        return lambda func: _cache_by_text(func, maxsize)
+    
+    cached = lru_cache(maxsize=maxsize)(func)
+    
+    @wraps(func)
+    def wrapper(text):
+        if isinstance(text, str) and len(text) > _cache_text_limit:
+            return func(text)
+        return cached(text)
+    
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+@_cache_by_text
 def flesch_kincaid_reading_ease(text):
     """https://en.wikipedia.org/wiki/Flesch%E2%80%93Kincaid_readability_tests
     206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
     """
-    text = clean_text(text)
-    
-    words = _count_words(text)
-    sentences = _count_sentences(text)
-    syllables = _count_syllables(text)
+    words, sentences, syllables = _counts(text, 'words', 'sentences', 'syllables')
     
     words_over_sentences = words / sentences
     syllables_over_words = syllables / words
     
-    score = D(206.835) - (D(1.015) * words_over_sentences) - (D(84.6) * syllables_over_words)
+    score = 206.835 - (1.015 * words_over_sentences) - (84.6 * syllables_over_words)
     
     return score
 
+@_cache_by_text
 def flesch_kincaid_grade_level(text):
     """https://en.wikipedia.org/wiki/Flesch%E2%80%93Kincaid_readability_tests
     0.39 * (words / sentences) + 11.8 * (syllables / words) - 15.59
     """
-    text = clean_text(text)
-    
-    words = _count_words(text)
-    sentences = _count_sentences(text)
-    syllables = _count_syllables(text)
+    words, sentences, syllables = _counts(text, 'words', 'sentences', 'syllables')
     
     words_over_sentences = words / sentences
     syllables_over_words = syllables / words
     
-    score = (D(0.39) * words_over_sentences) + (D(11.8) * syllables_over_words) - D(15.59)
+    score = (0.39 * words_over_sentences) + (11.8 * syllables_over_words) - 15.59
     
     return score
 
+@_cache_by_text
 def gunning_fog_score(text):
     """https://en.wikipedia.org/wiki/Gunning_fog_index
     0.4 * ((words / sentences) + 100 * (complex_words / words))
     """
-    text = clean_text(text)
-    
-    words = _count_words(text)
-    sentences = _count_sentences(text)
-    complex_words = _count_complex_words(text)
+    words, sentences, complex_words = _counts(text, 'words', 'sentences', 'polysyllables')
     
     words_over_sentences = words / sentences
     complex_over_normal = complex_words / words
     
-    score = D(0.4) * (words_over_sentences + (100 * complex_over_normal))
+    score = 0.4 * (words_over_sentences + (100 * complex_over_normal))
     
     return score
 
+@_cache_by_text
 def coleman_liau_index(text):
     """https://en.wikipedia.org/wiki/Coleman%E2%80%93Liau_index
     Lower = Easier to read
@@ -70,81 +102,169 @@ def coleman_liau_index(text):
     S = average number of sentences per 100 words
     (0.0588 * L) - (0.296 * S) - 15.8
     """
-    text = clean_text(text)
-    
-    words = _count_words(text)
-    sentences = _count_sentences(text)
-    letters = _count_letters(text)
+    words, sentences, letters = _counts(text, 'words', 'sentences', 'letters')
     
-    L = (letters / words) * D(100)
-    S = (sentences / words) * D(100)
+    L = (letters / words) * 100
+    S = (sentences / words) * 100
     
-    score = (D(0.0588) * L) - (D(0.296) * S) - D(15.8)
+    score = (0.0588 * L) - (0.296 * S) - 15.8
     
     return score
 
+@_cache_by_text
 def smog_index(text):
     """https://en.wikipedia.org/wiki/SMOG
     
     1.043 * sqrt(polysyllables * (30 / sentences) + 3.1291)
     """
-    text = clean_text(text)
+    sentences, polysyllables = _counts(text, 'sentences', 'polysyllables')
     
-    sentences = _count_sentences(text)
-    polysyllables = _count_complex_words(text)
-    
-    score = D(1.043) * D(sqrt(polysyllables * (D(30) / sentences) + D(3.1291)))
+    score = 1.043 * sqrt(polysyllables * (30 / sentences) + 3.1291)
     
     return score
 
+@_cache_by_text
 def automated_readability_index(text):
     """https://en.wikipedia.org/wiki/Automated_Readability_Index
     
     4.71 * (characters / words) + 0.5 * (words / sentences) - 21.43
     """
-    text = clean_text(text)
-    
-    words = _count_words(text)
-    sentences = _count_sentences(text)
-    letters = _count_letters(text)
+    words, sentences, letters = _counts(text, 'words', 'sentences', 'letters')
     
-    score = D(4.71) * (letters / words) + (D(0.5) * (words / sentences)) - D(21.43)
+    score = 4.71 * (letters / words) + (0.5 * (words / sentences)) - 21.43
     
     return score
 
+@dataclass(frozen=True, slots=True)
+class TextStats:
+    """The counts the scores are worked out from"""
+    words: int
+    sentences: int
+    letters: int
+    syllables: int
+    polysyllables: int
+
+def _counts(text, *names):
+    """The named counts for either a string or a TextStats. Anything needing
+    syllables reads from the single scan, the character counts alone are
+    cheap enough that they're worked out directly"""
+    if isinstance(text, str) and _syllable_fields.isdisjoint(names):
+        text = clean_text(text)
+        return [_counters[name](text) for name in names]
+    
+    stats = analyze(text)
+    return [getattr(stats, name) for name in names]
+
+def analyze(text):
+    """Counts everything the scores need in one go, any of the score functions
+    will accept the result in place of the text"""
+    if isinstance(text, TextStats):
+        return text
+    
+    return TextStats(*_scan_once(clean_text(text)))
+
+def batch_scores(texts):
+    """Scores a list of texts against every index in one go, returning a dict
+    of numpy arrays keyed by the name of the single text function. Each text
+    is only counted once and the formulas are then applied to the whole batch.
+    
+    Requires numpy.
+    """
+    if np is None:
+        raise ImportError("batch_scores requires numpy")
+    
+    count = len(texts)
+    words = np.empty(count, dtype=np.int64)
+    sentences = np.empty(count, dtype=np.int64)
+    letters = np.empty(count, dtype=np.int64)
+    syllables = np.empty(count, dtype=np.int64)
+    complex_words = np.empty(count, dtype=np.int64)
+    
+    for i, text in enumerate(texts):
+        stats = analyze(text)
+        
+        words[i] = stats.words
+        sentences[i] = stats.sentences
+        letters[i] = stats.letters
+        syllables[i] = stats.syllables
+        complex_words[i] = stats.polysyllables
+    
+    words_over_sentences = words / sentences
+    syllables_over_words = syllables / words
+    letters_over_words = letters / words
+    
+    return {
+        'flesch_kincaid_reading_ease': 206.835 - (1.015 * words_over_sentences) - (84.6 * syllables_over_words),
+        'flesch_kincaid_grade_level': (0.39 * words_over_sentences) + (11.8 * syllables_over_words) - 15.59,
+        'gunning_fog_score': 0.4 * (words_over_sentences + (100 * (complex_words / words))),
+        'coleman_liau_index': (0.0588 * letters_over_words * 100) - (0.296 * (sentences / words) * 100) - 15.8,
+        'smog_index': 1.043 * np.sqrt(complex_words * (30 / sentences) + 3.1291),
+        'automated_readability_index': 4.71 * letters_over_words + (0.5 * words_over_sentences) - 21.43,
+    }
+
+# Patterns for clean_text, ported from the PHP version
+_re_clean_full_stop_tags = re.compile(r'</(?:li|p|h[1-6]|dd)>', re.IGNORECASE)
+_re_clean_tags = re.compile(r'<[^>]*>')
+_re_clean_new_lines = re.compile(r' *(?:\n|\r\n|\r) *')
+_re_clean_duplicate_terminators = re.compile(r'\.[. ]+')
+_re_clean_space_before_terminators = re.compile(r' +\.')
+_re_clean_numbers = re.compile(r'(?<= )[0-9]+(?= )')
+_re_clean_spaces = re.compile(r'  +')
+_re_clean_after_terminator = re.compile(r'\. [^ ]+')
+
+# Commas, hyphens, quotes etc count as spaces and all terminators become a
+# full stop, a single translate does both in one pass over the text
+_clean_translation = str.maketrans('",:;()-!?', '       ..')
+
+@_cache_by_text
 def clean_text(text):
-    return text
-    # static $clean = array();
-
-    # if (isset($clean[$strText])) {
-    #     return $clean[$strText];
-    # }
-
-    # $key = $strText;
-
-    # // all these tags should be preceeded by a full stop.
-    # $fullStopTags = array('li', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'dd');
-    # foreach ($fullStopTags as $tag) {
-    #     $strText = str_ireplace('</'.$tag.'>', '.', $strText);
-    # }
-    # $strText = strip_tags($strText);
-    # $strText = preg_replace('/[",:;()-]/', ' ', $strText); // Replace commas, hyphens, quotes etc (count them as spaces)
-    # $strText = preg_replace('/[\.!?]/', '.', $strText); // Unify terminators
-    # $strText = trim($strText) . '.'; // Add final terminator, just in case it's missing.
-    # $strText = preg_replace('/[ ]*(\n|\r\n|\r)[ ]*/', ' ', $strText); // Replace new lines with spaces
-    # $strText = preg_replace('/([\.])[\. ]+/', '$1', $strText); // Check for duplicated terminators
-    # $strText = trim(preg_replace('/[ ]*([\.])/', '$1 ', $strText)); // Pad sentence terminators
-    # $strText = preg_replace('/ [0-9]+ /', ' ', ' ' . $strText . ' '); // Remove "words" comprised only of numbers
-    # $strText = preg_replace('/[ ]+/', ' ', $strText); // Remove multiple spaces
-    # $strText = preg_replace_callback('/\. [^ ]+/', create_function('$matches', 'return strtolower($matches[0]);'), $strText); // Lower case all words following terminators (for gunning fog score)
-
-    # $strText = trim($strText);
-
-    # // Cache it and return
-    # $clean[$key] = $strText;
-    # return text.strip()
-
-_re_count_sentences = re.compile(r'[^\.!?]')
+    # All these tags should be preceeded by a full stop
+    text = _re_clean_full_stop_tags.sub('.', text)
+    text = _re_clean_tags.sub('', text)
+    
+    text = text.translate(_clean_translation)
+    
+    # Add final terminator, just in case it's missing
+    text = text.strip() + '.'
+    
+    # Replace new lines with spaces, runs of spaces are only collapsed once
+    # the numbers are gone so that numbers next to each other are all removed
+    text = _re_clean_new_lines.sub(' ', text)
+    
+    # Check for duplicated terminators
+    text = _re_clean_duplicate_terminators.sub('.', text)
+    
+    # Pad sentence terminators
+    text = _re_clean_space_before_terminators.sub('.', text).replace('.', '. ').strip()
+    
+    # Remove "words" comprised only of numbers, the lookarounds leave the
+    # spaces in place so a run of numbers is removed rather than every other one
+    text = _re_clean_numbers.sub('', ' ' + text + ' ')
+    text = _re_clean_spaces.sub(' ', text)
+    
+    # Lower case all words following terminators (for gunning fog score)
+    text = _re_clean_after_terminator.sub(lambda m: m.group(0).lower(), text)
+    
+    return text.strip()
+
+# Every byte maps to the class it is counted under, l for the letters and
+# digits, a space for spaces, a full stop for terminators and _ for the rest
+_char_classes = bytes(
+    ord('l') if chr(b).isascii() and chr(b).isalnum()
+    else ord(' ') if b == ord(' ')
+    else ord('.') if chr(b) in '.!?'
+    else ord('_')
+    for b in range(256)
+)
+
+@_cache_by_text(maxsize=32)
+def _classify(text):
+    """Letters, spaces and terminators counted from a single translate of the
+    text, the word, sentence and letter counters all read from this"""
+    # Encoding drops anything outside of ASCII, none of which is counted
+    classes = text.encode('ascii', 'ignore').translate(_char_classes)
+    return classes.count(b'l'), classes.count(b' '), classes.count(b'.')
+
 _re_remove_fake_sentences = (
     re.compile(r'[A-Z]\.[A-Z]\.'),
     re.compile(r'Mr\.'),
@@ -154,115 +274,442 @@ def _count_sentences(text):
         return 0
     
     # Remove "words" such as U.K. and Mr.
+    # When there are none the same string comes back so _classify is still cached
     for remover in _re_remove_fake_sentences:
         text = remover.sub('', text)
     
-    return D(max(1, len(_re_count_sentences.sub('', text))))
+    letters, spaces, terminators = _classify(text)
+    return max(1, terminators)
+
+def _tokenize(text):
+    # Will be tripped by em dashes with spaces either side, among other similar characters
+    return text.split(' ')
 
-_re_count_words = re.compile(r'[^ ]')
 def _count_words(text):
     if len(text) == 0:
         return 0
     
-    # Will be tripped by em dashes with spaces either side, among other similar characters
-    # Space count + 1 is word count
-    return D(1 + len(_re_count_words.sub('', text)))
+    # Space count + 1 is word count, counting them saves building the list of words
+    letters, spaces, terminators = _classify(text)
+    return spaces + 1
 
 def average_words_per_sentence(text):
     raise Exception("Not implemented")
 
-def _count_syllables(text):
-    words = text.split(' ')
-    return D(sum(map(syllable_count, words)))
-
-def _count_complex_words(text):
-    """Words with 3 or more syllables"""
-    
-    words = text.split(' ')
-    
-    long_words = len(tuple(filter(
-        lambda w: _count_syllables(w) >= 3,
-        words
-    )))
-    
-    return D(long_words)/D(len(words))
+@_cache_by_text(maxsize=32)
+def _scan_once(text):
+    """All of the counts for a cleaned text as (words, sentences, letters,
+    syllables, polysyllables). The characters are classified in one pass and
+    the words split out in another, each word's syllables are then counted
+    once with the complex words picked out from them.
+    """
+    letters, spaces, terminators = _classify(text)
+    syllables = [syllable_count(w) for w in _tokenize(text)]
+    
+    return (
+        spaces + 1,
+        _count_sentences(text),
+        letters,
+        sum(syllables),
+        sum(1 for c in syllables if c >= 3),
+    )
 
-_re_letters_and_digits = re.compile(r'[^a-zA-Z0-9]')
 def _count_letters(text):
-    text = _re_letters_and_digits.sub('', text)
-    return len(text)
+    letters, spaces, terminators = _classify(text)
+    return letters
+
+# The counter behind each TextStats field not needing syllables
+_counters = {
+    'words': _count_words,
+    'sentences': _count_sentences,
+    'letters': _count_letters,
+}
+_syllable_fields = frozenset(('syllables', 'polysyllables'))
 
 _syllable_problem_words = {
-    'simile': 3,
-    'forever': 3,
-    'shoreline': 2,
+    b'simile': 3,
+    b'forever': 3,
+    b'shoreline': 2,
 }
 
 # These syllables would be counted as two but should be one
 _sub_syllables = (
-    re.compile(r'cial'),
-    re.compile(r'tia'),
-    re.compile(r'cius'),
-    re.compile(r'cious'),
-    re.compile(r'giu'),
-    re.compile(r'ion'),
-    re.compile(r'iou'),
-    re.compile(r'sia$'),
-    re.compile(r'[^aeiuoyt]{2,}ed$'),
-    re.compile(r'.ely$'),
-    re.compile(r'[cg]h?e[rsd]?$'),
-    re.compile(r'rved?$'),
-    re.compile(r'[aeiouy][dt]es?$'),
-    re.compile(r'[aeiouy][^aeiouydt]e[rsd]?$'),
-    re.compile(r'[aeiouy]rse$'), #Purse, hearse
+    re.compile(rb'cial'),
+    re.compile(rb'tia'),
+    re.compile(rb'cius'),
+    re.compile(rb'cious'),
+    re.compile(rb'giu'),
+    re.compile(rb'ion'),
+    re.compile(rb'iou'),
+    re.compile(rb'sia$'),
+    re.compile(rb'[^aeiuoyt]{2,}ed$'),
+    re.compile(rb'.ely$'),
+    re.compile(rb'[cg]h?e[rsd]?$'),
+    re.compile(rb'rved?$'),
+    re.compile(rb'[aeiouy][dt]es?$'),
+    re.compile(rb'[aeiouy][^aeiouydt]e[rsd]?$'),
+    re.compile(rb'[aeiouy]rse$'), #Purse, hearse
 )
 
 # These syllables would be counted as one but should be two
 _add_syllables = (
-    re.compile(r'ia'),
-    re.compile(r'riet'),
-    re.compile(r'dien'),
-    re.compile(r'iu'),
-    re.compile(r'io'),
-    re.compile(r'ii'),
-    re.compile(r'[aeiouym]bl$'),
-    re.compile(r'[aeiou]{3}'),
-    re.compile(r'^mc'),
-    re.compile(r'ism$'),
-    re.compile(r'([^aeiouy])\1l$'),
-    re.compile(r'[^l]lien'),
-    re.compile(r'^coa[dglx].'),
-    re.compile(r'[^gq]ua[^auieo]'),
-    re.compile(r'dnt$'),
-    re.compile(r'uity$'),
-    re.compile(r'ie(r|st)$'),
+    re.compile(rb'ia'),
+    re.compile(rb'riet'),
+    re.compile(rb'dien'),
+    re.compile(rb'iu'),
+    re.compile(rb'io'),
+    re.compile(rb'ii'),
+    re.compile(rb'[aeiouym]bl$'),
+    re.compile(rb'[aeiou]{3}'),
+    re.compile(rb'^mc'),
+    re.compile(rb'ism$'),
+    re.compile(rb'(?P<double>[^aeiouy])(?P=double)l$'),
+    re.compile(rb'[^l]lien'),
+    re.compile(rb'^coa[dglx].'),
+    re.compile(rb'[^gq]ua[^auieo]'),
+    re.compile(rb'dnt$'),
+    re.compile(rb'uity$'),
+    re.compile(rb'ie(r|st)$'),
 )
 
-# Single syllable prefixes and suffixes
-_syllable_prefix_suffix = (
-    re.compile(r'^un'),
-    re.compile(r'^fore'),
-    re.compile(r'ly$'),
-    re.compile(r'less$'),
-    re.compile(r'ful$'),
-    re.compile(r'ers?$'),
-    re.compile(r'ings?$'),
+# The patterns anchored to the end of a word can only match a word with one
+# of these endings, endswith is far cheaper than a search starting from
+# every position in the word so it's checked first
+_syllable_pattern_endings = {
+    rb'sia$': (b'sia',),
+    rb'[^aeiuoyt]{2,}ed$': (b'ed',),
+    rb'.ely$': (b'ely',),
+    rb'[cg]h?e[rsd]?$': (b'e', b'er', b'es', b'ed'),
+    rb'rved?$': (b'rve', b'rved'),
+    rb'[aeiouy][dt]es?$': (b'de', b'te', b'des', b'tes'),
+    rb'[aeiouy][^aeiouydt]e[rsd]?$': (b'e', b'er', b'es', b'ed'),
+    rb'[aeiouy]rse$': (b'rse',),
+    rb'[aeiouym]bl$': (b'bl',),
+    rb'ism$': (b'ism',),
+    rb'(?P<double>[^aeiouy])(?P=double)l$': (b'l',),
+    rb'dnt$': (b'dnt',),
+    rb'uity$': (b'uity',),
+    rb'ie(r|st)$': (b'ier', b'iest'),
+}
+
+def _syllable_rules(patterns):
+    return tuple((p, _syllable_pattern_endings.get(p.pattern)) for p in patterns)
+
+_sub_syllable_rules = _syllable_rules(_sub_syllables)
+_add_syllable_rules = _syllable_rules(_add_syllables)
+
+def _fuse_syllable_patterns(patterns):
+    """Join a group of patterns into a single alternation, most words match
+    none of the group so one search lets us skip the individual patterns"""
+    return re.compile(b'|'.join(b'(?:' + p.pattern + b')' for p in patterns))
+
+_re_any_sub_syllable = _fuse_syllable_patterns(_sub_syllables)
+_re_any_add_syllable = _fuse_syllable_patterns(_add_syllables)
+
+def _count_matching_patterns(rules, fused, text):
+    """The number of patterns found in the text, each pattern counts at most once"""
+    if fused.search(text) is None:
+        return 0
+    
+    count = 0
+    for pattern, endings in rules:
+        if endings is not None and not text.endswith(endings):
+            continue
+        if pattern.search(text):
+            count += 1
+    return count
+
+# With hyperscan installed all of the sub and add patterns are compiled into
+# one database so a single scan of the word reports every pattern it matches.
+# Hyperscan has no backreferences so any pattern using them stays with re.
+# A scratch can only be used by one scan at a time so each thread clones its
+# own from the prototype
+def _compile_syllable_database():
+    adjustments = tuple((p, -1) for p in _sub_syllables) + tuple((p, 1) for p in _add_syllables)
+    scanned = [(i, p) for i, (p, _) in enumerate(adjustments) if b'(?P=' not in p.pattern]
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[p.pattern for _, p in scanned],
+        ids=[i for i, _ in scanned],
+        elements=len(scanned),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(scanned),
+    )
+    
+    weights = tuple(weight for _, weight in adjustments)
+    unscanned = tuple((p, weight) for p, weight in adjustments if b'(?P=' in p.pattern)
+    return database, hyperscan.Scratch(database), weights, unscanned
+
+if hyperscan is not None:
+    _syllable_database, _syllable_scratch, _syllable_weights, _syllable_unscanned = _compile_syllable_database()
+    _syllable_thread_scratch = threading.local()
+
+def _thread_scratch():
+    try:
+        return _syllable_thread_scratch.scratch
+    except AttributeError:
+        _syllable_thread_scratch.scratch = _syllable_scratch.clone()
+        return _syllable_thread_scratch.scratch
+
+def _scan_syllable_adjustments(text):
+    """Add syllables less sub syllables found in the text, each pattern
+    counts at most once"""
+    matched = []
+    def on_match(pattern_id, start, end, flags, context):
+        matched.append(_syllable_weights[pattern_id])
+    
+    _syllable_database.scan(text, match_event_handler=on_match, scratch=_thread_scratch())
+    
+    adjustment = sum(matched)
+    for pattern, weight in _syllable_unscanned:
+        if pattern.search(text):
+            adjustment += weight
+    return adjustment
+
+# Single syllable prefixes and suffixes, each is removed at most once and in
+# this order. Where a suffix has a longer form it is listed first
+_syllable_prefixes = (b'un', b'fore')
+_syllable_suffixes = (
+    (b'ly',),
+    (b'less',),
+    (b'ful',),
+    (b'ers', b'er'),
+    (b'ings', b'ing'),
 )
 
-_re_syllable_non_word_chars = re.compile(r'[^a-z]')
-_re_syllable_word_parts = re.compile(r'[^aeiouy]+')
+# The same rules as above written as a plain scan over the bytes of the word
+# so numba can compile them, only used when numba is installed
+def _jit(func):
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+@_jit
+def _is_one_of(c, chars):
+    for char in chars:
+        if c == char:
+            return True
+    return False
+
+@_jit
+def _starts_with(word, length, literal):
+    if len(literal) > length:
+        return False
+    for i in range(len(literal)):
+        if word[i] != literal[i]:
+            return False
+    return True
+
+@_jit
+def _ends_with(word, length, literal):
+    offset = length - len(literal)
+    if offset < 0:
+        return False
+    for i in range(len(literal)):
+        if word[offset + i] != literal[i]:
+            return False
+    return True
+
+@_jit
+def _contains(word, length, literal):
+    for start in range(length - len(literal) + 1):
+        found = True
+        for i in range(len(literal)):
+            if word[start + i] != literal[i]:
+                found = False
+                break
+        if found:
+            return True
+    return False
+
+@_jit
+def _ends_with_optional(word, length, before, optional):
+    """Position of `before` if it ends the word, allowing for one optional
+    trailing character as in 'e[rsd]?$', otherwise -1"""
+    if length > 0 and _is_one_of(word[length - 1], optional):
+        length -= 1
+    if length > 0 and word[length - 1] == before:
+        return length - 1
+    return -1
+
+@_jit
+def _count_sub_syllables(word, length):
+    count = 0
+    
+    for literal in (b'cial', b'tia', b'cius', b'cious', b'giu', b'ion', b'iou'):
+        if _contains(word, length, literal):
+            count += 1
+    
+    if _ends_with(word, length, b'sia'):
+        count += 1
+    
+    # [^aeiuoyt]{2,}ed$
+    if length >= 4 and _ends_with(word, length, b'ed') \
+            and not _is_one_of(word[length - 3], b'aeiuoyt') \
+            and not _is_one_of(word[length - 4], b'aeiuoyt'):
+        count += 1
+    
+    # .ely$
+    if length >= 4 and _ends_with(word, length, b'ely'):
+        count += 1
+    
+    # [cg]h?e[rsd]?$
+    i = _ends_with_optional(word, length, ord('e'), b'rsd')
+    if i > 0:
+        if _is_one_of(word[i - 1], b'cg'):
+            count += 1
+        elif i > 1 and word[i - 1] == ord('h') and _is_one_of(word[i - 2], b'cg'):
+            count += 1
+    
+    # rved?$
+    if _ends_with(word, length, b'rve') or _ends_with(word, length, b'rved'):
+        count += 1
+    
+    # [aeiouy][dt]es?$
+    i = _ends_with_optional(word, length, ord('e'), b's')
+    if i > 1 and _is_one_of(word[i - 1], b'dt') and _is_one_of(word[i - 2], b'aeiouy'):
+        count += 1
+    
+    # [aeiouy][^aeiouydt]e[rsd]?$
+    i = _ends_with_optional(word, length, ord('e'), b'rsd')
+    if i > 1 and not _is_one_of(word[i - 1], b'aeiouydt') and _is_one_of(word[i - 2], b'aeiouy'):
+        count += 1
+    
+    # [aeiouy]rse$
+    if length >= 4 and _ends_with(word, length, b'rse') and _is_one_of(word[length - 4], b'aeiouy'):
+        count += 1
+    
+    return count
+
+@_jit
+def _count_add_syllables(word, length):
+    count = 0
+    
+    for literal in (b'ia', b'riet', b'dien', b'iu', b'io', b'ii'):
+        if _contains(word, length, literal):
+            count += 1
+    
+    # [aeiouym]bl$
+    if length >= 3 and _ends_with(word, length, b'bl') and _is_one_of(word[length - 3], b'aeiouym'):
+        count += 1
+    
+    # [aeiou]{3}
+    run = 0
+    for i in range(length):
+        if _is_one_of(word[i], b'aeiou'):
+            run += 1
+            if run == 3:
+                count += 1
+                break
+        else:
+            run = 0
+    
+    if _starts_with(word, length, b'mc'):
+        count += 1
+    
+    if _ends_with(word, length, b'ism'):
+        count += 1
+    
+    # ([^aeiouy])\1l$
+    if length >= 3 and word[length - 1] == ord('l') and word[length - 2] == word[length - 3] \
+            and not _is_one_of(word[length - 2], b'aeiouy'):
+        count += 1
+    
+    # [^l]lien
+    for i in range(1, length - 3):
+        if word[i - 1] != ord('l') and _starts_with(word[i:], length - i, b'lien'):
+            count += 1
+            break
+    
+    # ^coa[dglx].
+    if length >= 5 and _starts_with(word, length, b'coa') and _is_one_of(word[3], b'dglx'):
+        count += 1
+    
+    # [^gq]ua[^auieo]
+    for i in range(length - 3):
+        if not _is_one_of(word[i], b'gq') and word[i + 1] == ord('u') and word[i + 2] == ord('a') \
+                and not _is_one_of(word[i + 3], b'auieo'):
+            count += 1
+            break
+    
+    for literal in (b'dnt', b'uity', b'ier', b'iest'):
+        if _ends_with(word, length, literal):
+            count += 1
+    
+    return count
+
+@_jit
+def _syllable_count_bytes(word):
+    """Takes the lowercased a-z and 0-9 bytes of a word which is not one of
+    the problem words"""
+    start = 0
+    end = len(word)
+    prefix_suffix_count = 0
+    
+    for prefix in (b'un', b'fore'):
+        if _starts_with(word[start:end], end - start, prefix):
+            start += len(prefix)
+            prefix_suffix_count += 1
+    
+    for suffix in (b'ly', b'less', b'ful'):
+        if _ends_with(word[start:end], end - start, suffix):
+            end -= len(suffix)
+            prefix_suffix_count += 1
+    
+    for suffix, shorter in ((b'ers', b'er'), (b'ings', b'ing')):
+        if _ends_with(word[start:end], end - start, suffix):
+            end -= len(suffix)
+            prefix_suffix_count += 1
+        elif _ends_with(word[start:end], end - start, shorter):
+            end -= len(shorter)
+            prefix_suffix_count += 1
+    
+    # Remove non-word characters from word
+    letters = np.empty(end - start, dtype=np.uint8)
+    length = 0
+    for i in range(start, end):
+        if ord('a') <= word[i] <= ord('z'):
+            letters[length] = word[i]
+            length += 1
+    
+    word_part_count = 0
+    in_vowels = False
+    for i in range(length):
+        if _is_one_of(letters[i], b'aeiouy'):
+            if not in_vowels:
+                word_part_count += 1
+            in_vowels = True
+        else:
+            in_vowels = False
+    
+    syllable_count = word_part_count + prefix_suffix_count
+    syllable_count -= _count_sub_syllables(letters, length)
+    syllable_count += _count_add_syllables(letters, length)
+    
+    if syllable_count == 0:
+        syllable_count = 1
+    
+    return syllable_count
+
+# Words are worked on as ASCII bytes, by the time the rules are applied
+# nothing outside of a-z is left and bytes avoid the unicode handling in re
+_non_letter_or_digit_bytes = bytes(b for b in range(128) if not chr(b).isalnum())
+_digit_bytes = b'0123456789'
+_re_syllable_word_parts = re.compile(rb'[^aeiouy]+')
+@lru_cache(maxsize=65536)
 def syllable_count(text):
     """This is not an easy problem to solve: https://stackoverflow.com/questions/405161/detecting-syllables-in-a-word
     The accepted answer links to a thesis on the problem: http://www.tug.org/docs/liang/
+    
+    Results are cached per word as the same words come up again and again in
+    any real text, use syllable_count.cache_clear() to reset it.
     """
     
     if len(text) == 0: return 0
     
     # We don't care about case, we can assume lowercase for everything make it easier
-    text = text.lower()
-    
-    # Remove all non alpha characters
-    text = _re_letters_and_digits.sub('', text)
+    # Then remove all non alpha characters, encoding drops anything outside of ASCII
+    text = text.lower().encode('ascii', 'ignore').translate(None, _non_letter_or_digit_bytes)
     
     syllable_count = 0
     
@@ -271,36 +718,44 @@ def syllable_count(text):
     if text in _syllable_problem_words:
         return _syllable_problem_words[text]
     
+    if njit is not None:
+        return _syllable_count_bytes(np.frombuffer(text, dtype=np.uint8))
+    
     # Remove prefixes and suffixes and count how many were taken
-    # Interestingly this is a longer piece of code than the PHP version
     prefix_suffix_count = 0
-    for pf in _syllable_prefix_suffix:
-        prefix_suffix_count += len(pf.findall(text))
-        text = pf.sub('', text)
+    for prefix in _syllable_prefixes:
+        if text.startswith(prefix):
+            prefix_suffix_count += 1
+            text = text[len(prefix):]
+    
+    for suffixes in _syllable_suffixes:
+        for suffix in suffixes:
+            if text.endswith(suffix):
+                prefix_suffix_count += 1
+                text = text[:-len(suffix)]
+                break
     
     # Remove non-word characters from word
-    text = _re_syllable_non_word_chars.sub('', text)
+    text = text.translate(None, _digit_bytes)
     word_parts = _re_syllable_word_parts.split(text)
     
     word_part_count = 0;
     for word_part in word_parts:
-        if word_part != '':
+        if word_part != b'':
             word_part_count += 1
     
     # Some syllables do not follow normal rules
     syllable_count = word_part_count + prefix_suffix_count
-    for re_syllable in _sub_syllables:
-        if re_syllable.search(text):
-            syllable_count -= 1
-    
-    for re_syllable in _add_syllables:
-        if re_syllable.search(text):
-            syllable_count += 1
+    if hyperscan is not None:
+        syllable_count += _scan_syllable_adjustments(text)
+    else:
+        syllable_count -= _count_matching_patterns(_sub_syllable_rules, _re_any_sub_syllable, text)
+        syllable_count += _count_matching_patterns(_add_syllable_rules, _re_any_add_syllable, text)
     
     if syllable_count == 0:
         syllable_count = 1
     
-    return D(syllable_count)
+    return syllable_count
 
 if __name__ == '__main__':
     sentence = sys.argv[1]
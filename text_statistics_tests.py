@@ -0,0 +1,138 @@
+import unittest
+from unittest import mock
+
+import text_statistics
+
+toad_hall = "There's Toad Hall,' said the Rat; 'and that creek on the left, where the notice-board says, 'Private. No landing allowed,' leads to his boat-house, where we'll leave the boat. The stables are over there to the right. That's the banqueting-hall you're looking at now - very old, that is. Toad is rather rich, you know, and this is really one of the nicest houses in these parts, though we never admit as much to Toad."
+
+warranties = "The foregoing warranties by each party are in lieu of all other warranties, express or implied, with respect to this agreement, including but not limited to implied warranties of merchantability and fitness for a particular purpose. Neither party shall have any liability whatsoever for any cover or setoff nor for any indirect, consequential, exemplary, incidental or punitive damages, including lost profits, even if such party has been advised of the possibility of such damages."
+
+scorers = (
+    text_statistics.flesch_kincaid_reading_ease,
+    text_statistics.flesch_kincaid_grade_level,
+    text_statistics.gunning_fog_score,
+    text_statistics.coleman_liau_index,
+    text_statistics.smog_index,
+    text_statistics.automated_readability_index,
+)
+
+# Expected scores for toad_hall and warranties
+known_scores = {
+    text_statistics.flesch_kincaid_reading_ease: (91.2056, 8.0827),
+    text_statistics.flesch_kincaid_grade_level: (4.4631, 21.3238),
+    text_statistics.gunning_fog_score: (6.8263, 24.5297),
+    text_statistics.coleman_liau_index: (5.7722, 15.1043),
+    text_statistics.smog_index: (3.1514, 17.2373),
+    text_statistics.automated_readability_index: (5.2504, 22.4658),
+}
+
+class ScoreTests(unittest.TestCase):
+    def test_known_scores(self):
+        for scorer, expected in known_scores.items():
+            for text, score in zip((toad_hall, warranties), expected):
+                self.assertIsInstance(scorer(text), float)
+                self.assertAlmostEqual(scorer(text), score, places=4, msg=scorer.__name__)
+
+    def test_analyze(self):
+        self.assertEqual(text_statistics.analyze(toad_hall), text_statistics.TextStats(79, 5, 315, 93, 1))
+        self.assertEqual(text_statistics.analyze(warranties), text_statistics.TextStats(74, 2, 399, 141, 18))
+
+        stats = text_statistics.analyze(toad_hall)
+        self.assertIs(text_statistics.analyze(stats), stats)
+
+    def test_scores_from_stats(self):
+        for text in (toad_hall, warranties, 'A short one.'):
+            stats = text_statistics.analyze(text)
+            for scorer in scorers:
+                self.assertEqual(scorer(stats), scorer(text), scorer.__name__)
+
+    @unittest.skipIf(text_statistics.np is None, 'numpy is not installed')
+    def test_batch_scores(self):
+        texts = [toad_hall, warranties, 'A short one.', toad_hall + ' ' + warranties]
+        results = text_statistics.batch_scores(texts)
+        self.assertEqual(sorted(results), sorted(scorer.__name__ for scorer in scorers))
+        for scorer in scorers:
+            for text, score in zip(texts, results[scorer.__name__]):
+                self.assertAlmostEqual(float(score), scorer(text), places=9, msg=scorer.__name__)
+
+# Word and expected count pairs, these cover the prefixes, suffixes and each
+# of the sub and add syllable rules along with a few problem words
+syllable_words = {
+    'the': 1, 'cat': 1, 'simile': 3, 'forever': 3, 'shoreline': 2,
+    'social': 2, 'initial': 3, 'precious': 2, 'religious': 4, 'nation': 2,
+    'unhappy': 3, 'foreshadow': 3, 'lovely': 2, 'careless': 2, 'hopeful': 2,
+    'runners': 2, 'singing': 2, 'tested': 2, 'lonely': 2, 'cache': 1,
+    'hedged': 1, 'curved': 1, 'made': 1, 'states': 1, 'awake': 2,
+    'purse': 1, 'giant': 2, 'variety': 4, 'audience': 3, 'medium': 3,
+    'radio': 3, 'skiing': 2, 'table': 2, 'queue': 2, 'mcdonald': 3,
+    'racism': 3, 'little': 2, 'alien': 3, 'coaxed': 2, 'equal': 2,
+    'couldnt': 2, 'annuity': 4, 'happier': 3, 'funniest': 3,
+    'readability': 5, 'syllables': 3, 'comfortable': 4, 'experience': 3,
+    'agreement': 3, 'merchantability': 6, 'I': 1, 'a': 1, '': 0,
+    'Hello!': 2, "don't": 1, 'U.K.': 1, '42': 1, 'x2ly': 1,
+    # Anything outside of ASCII is dropped before the rules are applied
+    'naïve': 1, 'café': 1, 'Über': 1, 'coöperate': 3, 'fiancée': 2,
+}
+
+class SyllableCountTests(unittest.TestCase):
+    def assert_counts(self):
+        # Skip the lru_cache so each path really gets run
+        for word, expected in syllable_words.items():
+            self.assertEqual(text_statistics.syllable_count.__wrapped__(word), expected, word)
+
+    @unittest.skipIf(text_statistics.njit is None, 'numba is not installed')
+    def test_numba(self):
+        self.assert_counts()
+
+    @unittest.skipIf(text_statistics.hyperscan is None, 'hyperscan is not installed')
+    def test_hyperscan(self):
+        with mock.patch.object(text_statistics, 'njit', None):
+            self.assert_counts()
+
+    def test_re(self):
+        with mock.patch.object(text_statistics, 'njit', None), \
+                mock.patch.object(text_statistics, 'hyperscan', None):
+            self.assert_counts()
+
+class CleanTextTests(unittest.TestCase):
+    def test_clean_text(self):
+        cases = {
+            '': '.',
+            'Hello <b>World</b>!  How are   you?\nFine.': 'Hello World. how are you. fine.',
+            '<p>One</p><p>Two</p>': 'One. two.',
+            'Wait... what?! Really': 'Wait. what. Really.',
+            'Pages 10 11 12 13 read.': 'Pages read.',
+            'I have 1, 2, 3 cats.': 'I have cats.',
+            'Agent 007 and R2D2 left.': 'Agent and R2D2 left.',
+        }
+        for text, expected in cases.items():
+            self.assertEqual(text_statistics.clean_text(text), expected, text)
+
+class CacheTests(unittest.TestCase):
+    cached = (
+        text_statistics.flesch_kincaid_reading_ease,
+        text_statistics.clean_text,
+        text_statistics._scan_once,
+        text_statistics._classify,
+    )
+
+    def setUp(self):
+        for func in self.cached:
+            func.cache_clear()
+
+    def test_long_texts_are_not_cached(self):
+        with mock.patch.object(text_statistics, '_cache_text_limit', 50):
+            text_statistics.flesch_kincaid_reading_ease(toad_hall)
+            for func in self.cached:
+                self.assertEqual(func.cache_info().currsize, 0, func.__name__)
+
+    def test_short_texts_are_cached(self):
+        with mock.patch.object(text_statistics, '_cache_text_limit', 50):
+            first = text_statistics.flesch_kincaid_reading_ease('A short one.')
+            self.assertEqual(text_statistics.flesch_kincaid_reading_ease('A short one.'), first)
+
+        info = text_statistics.flesch_kincaid_reading_ease.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+if __name__ == '__main__':
+    unittest.main()